@@ -1,22 +1,44 @@
 # scripts/api_server.py
 
+import asyncio
+import mmap
 import os
+import re
 import shutil
+import uuid
 from pathlib import Path
 from typing import Optional, Literal
 
+import aiofiles
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 
-from scripts.generate_report import run_report, DATA_DIR, REPORTS_DIR
+from scripts.generate_report import (
+    run_report_async,
+    clear_analysis_cache,
+    get_cached_pptx,
+    CURRENT_DATASET_PATH,
+    PDF_PATH,
+    PPTX_PATH,
+)
 
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_DIR = BASE_DIR.parent
 UPLOADS_DIR = PROJECT_DIR / "uploads"
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+ROW_COUNT_CHUNK_SIZE = 8 << 20  # 8 MiB
+_BLANK_LINES_RE = re.compile(rb"\n(?:[ \t\r]*\n)+")
+_LEADING_BLANK_LINE_RE = re.compile(rb"[ \t\r]*\n")
 
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
+# report_type → (file, media type) for /get-report
+REPORT_FILES = {
+    "pdf": (PDF_PATH, "application/pdf"),
+    "pptx": (PPTX_PATH, "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+}
+
 app = FastAPI(
     title="Automated Insight Engine API",
     version="1.0.0",
@@ -32,6 +54,74 @@ app.add_middleware(
 )
 
 
+def _unique_tmp_path(path: Path, suffix: str) -> Path:
+    """Sibling temp name that concurrent requests won't collide on."""
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex}{suffix}")
+
+
+def _mirror_file(src: Path, dst: Path, link: bool = True) -> None:
+    """
+    Expose src at dst via a hardlink (link=True, falling back to a copy across
+    filesystems) or as an independent copy (link=False).
+    dst is always swapped in with os.replace, never written in place, because it
+    may still be a hardlink to an earlier upload.
+    """
+    if link and dst.exists() and os.path.samefile(src, dst):
+        return
+
+    tmp_path = _unique_tmp_path(dst, ".tmp")
+    try:
+        if link:
+            try:
+                os.link(src, tmp_path)
+            except OSError:
+                link = False
+        if not link:
+            shutil.copy(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _count_csv_rows(path: Path) -> int:
+    """
+    Count data rows by scanning the mmap'd bytes for newlines, without parsing.
+    Quote parity is tracked so newlines inside quoted fields are not counted, and
+    blank (whitespace-only) lines are skipped, as pd.read_csv does.
+    """
+    if path.stat().st_size == 0:
+        return 0
+
+    records = 0
+    in_quotes = False
+    line_blank = True  # the current, unterminated line holds only whitespace so far
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, len(mm), ROW_COUNT_CHUNK_SIZE):
+            # Splitting on '"' alternates outside/inside quotes; keep only the outside
+            # text, with a '"' standing in for each quoted stretch so its line is non-blank
+            parts = mm[start:start + ROW_COUNT_CHUNK_SIZE].split(b'"')
+            text = b'"'.join(parts[1::2] if in_quotes else parts[::2])
+            if in_quotes:
+                text = b'"' + text
+            if len(parts) % 2 == 0:
+                in_quotes = not in_quotes
+            if in_quotes:
+                text += b'"'
+
+            # Fold blank lines into the newline before them; one left at the start of
+            # the chunk is blank only if the line it ends was blank so far
+            text = _BLANK_LINES_RE.sub(b"\n", text)
+            records += text.count(b"\n")
+            if line_blank and _LEADING_BLANK_LINE_RE.match(text):
+                records -= 1
+            tail_start = text.rfind(b"\n") + 1
+            line_blank = (line_blank or tail_start > 0) and not text[tail_start:].strip()
+        if not line_blank:
+            records += 1  # last line has no trailing newline
+
+    return max(records - 1, 0)  # minus header
+
+
 @app.get("/")
 async def root():
     return {"message": "Automated Insight Engine API is running."}
@@ -47,12 +137,21 @@ async def upload(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only CSV files are supported for now.")
 
     dest_path = UPLOADS_DIR / file.filename
-    with dest_path.open("wb") as f:
-        shutil.copyfileobj(file.file, f)
+    # Stream to a temp file first so a hardlinked current_dataset.csv is never truncated in place
+    part_path = _unique_tmp_path(dest_path, ".part")
+    try:
+        async with aiofiles.open(part_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+        os.replace(part_path, dest_path)
+    finally:
+        part_path.unlink(missing_ok=True)
 
-    # Also store as current_dataset.csv in data/ to be used by run_report()
-    current_dataset_path = Path(DATA_DIR) / "current_dataset.csv"
-    shutil.copy(dest_path, current_dataset_path)
+    # Also expose as current_dataset.csv in data/ to be used by run_report()
+    current_dataset_path = CURRENT_DATASET_PATH
+    await asyncio.to_thread(_mirror_file, dest_path, current_dataset_path)
+    # A hardlink keeps the source mtime, so the stat-keyed cache can't be relied on here
+    clear_analysis_cache()
 
     return {
         "message": "File uploaded successfully.",
@@ -72,17 +171,17 @@ async def ingest(
     if not csv_path.exists():
         raise HTTPException(status_code=404, detail=f"File not found: {csv_path}")
 
-    # Copy into data/current_dataset.csv
-    current_dataset_path = Path(DATA_DIR) / "current_dataset.csv"
-    shutil.copy(csv_path, current_dataset_path)
+    # Snapshot into data/current_dataset.csv: a copy, not a link, so later edits to the
+    # caller's file don't change the ingested data (swapped in, never written through a link)
+    current_dataset_path = CURRENT_DATASET_PATH
+    await asyncio.to_thread(_mirror_file, csv_path, current_dataset_path, link=False)
+    clear_analysis_cache()
 
-    # Optionally, we can load it to count rows
-    import pandas as pd
-    df = pd.read_csv(current_dataset_path)
+    rows = await asyncio.to_thread(_count_csv_rows, current_dataset_path)
 
     return {
         "message": "Ingestion successful.",
-        "rows": len(df),
+        "rows": rows,
         "current_dataset": str(current_dataset_path),
     }
 
@@ -98,11 +197,11 @@ async def analyze(
     )
 ):
     try:
-        result = run_report(csv_path=source, generate_files=False)
+        result = await run_report_async(csv_path=source, generate_files=False)
         return {
             "message": "Analysis completed.",
             "csv_path": result["csv_path"],
-            "plots": result["plots"],
+            "summaries": result["summaries"],
             "ai_summary": result["ai_summary"],
         }
     except Exception as e:
@@ -120,7 +219,7 @@ async def generate_report(
     )
 ):
     try:
-        result = run_report(csv_path=source, generate_files=True)
+        result = await run_report_async(csv_path=source, generate_files=True)
         return {
             "message": "Report generated successfully.",
             "csv_path": result["csv_path"],
@@ -138,14 +237,47 @@ async def generate_report(
 # ---------------------------
 @app.get("/get-report/{report_type}")
 async def get_report(report_type: Literal["pdf", "pptx"]):
-    if report_type == "pdf":
-        path = Path(REPORTS_DIR) / "netflix_report.pdf"
-        media_type = "application/pdf"
-    else:
-        path = Path(REPORTS_DIR) / "netflix_report.pptx"
-        media_type = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
-
-    if not path.exists():
+    path, media_type = REPORT_FILES[report_type]
+
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"{report_type.upper()} report not found. Generate it first.")
 
-    return FileResponse(str(path), filename=path.name, media_type=media_type)
+    if report_type == "pptx":
+        # Just built by this worker → serve the in-memory copy, no disk read
+        pptx_bytes = get_cached_pptx(stat_result)
+        if pptx_bytes is not None:
+            return Response(
+                content=pptx_bytes,
+                media_type=media_type,
+                headers={"Content-Disposition": f'attachment; filename="{path.name}"'},
+            )
+
+    # Reusing the 404-check stat saves FileResponse its own stat (one syscall instead of
+    # exists() + stat). The body is still read and sent in chunks by Starlette; neither
+    # the pinned Starlette nor uvicorn has a sendfile/pathsend path.
+    return FileResponse(path, filename=path.name, media_type=media_type, stat_result=stat_result)
+
+
+if __name__ == "__main__":
+    # Production launcher, from the project root:
+    #   python -m scripts.api_server
+    # Uses uvloop + httptools when installed (see requirements.txt) and one worker
+    # per core so concurrent report runs don't queue behind each other.
+    # Each worker keeps its own analysis cache and plot process pool; the pool gets
+    # max(1, cpu_count // WEB_CONCURRENCY) processes (capped at one per chart), so
+    # workers x plot processes stays at about one per core.
+    import uvicorn
+
+    workers = max(1, int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    uvicorn.run(
+        "scripts.api_server:app",
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "8000")),
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
@@ -1,288 +1,656 @@
 # scripts/generate_report.py
 
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib.util
+import io
+import json
+import multiprocessing
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from fpdf import FPDF
-from pptx import Presentation
-from pptx.util import Inches, Pt
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# pandas / matplotlib / fpdf / pptx / openai are imported where they are used, so
+# importing this module (e.g. by the API server at boot) stays cheap.
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Optional AI integration (for openai>=1.0.0)
-try:
-    import openai
-    AI_ENABLED = True
-except ImportError:
-    AI_ENABLED = False
+AI_ENABLED = importlib.util.find_spec("openai") is not None
+
+# Optional Arrow acceleration: multithreaded CSV parsing and vectorised regex
+# (falls back to pandas' C parser / str.extract)
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+CSV_ENGINE = "pyarrow" if PYARROW_AVAILABLE else "c"
+
+# Leading number of "90 min" / "2 Seasons"
+_DURATION_RE = re.compile(r"(\d+)")
 
 # ---------------------------
 # Paths / Folders
 # ---------------------------
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
-DATA_DIR = os.path.join(PROJECT_DIR, "data")
-REPORTS_DIR = os.path.join(PROJECT_DIR, "reports")
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = BASE_DIR.parent
+DATA_DIR = PROJECT_DIR / "data"
+REPORTS_DIR = PROJECT_DIR / "reports"
+
+CURRENT_DATASET_PATH = DATA_DIR / "current_dataset.csv"
+DEFAULT_DATASET_PATH = DATA_DIR / "netflix_titles.csv"
+PDF_PATH = REPORTS_DIR / "netflix_report.pdf"
+PPTX_PATH = REPORTS_DIR / "netflix_report.pptx"
+
+REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+# Report order of the plots (PDF pages / PPT slides)
+PLOT_KEYS = [
+    "top_genres",
+    "top_directors",
+    "rating_distribution",
+    "titles_per_year",
+    "type_count",
+    "avg_movie_duration",
+]
+PLOT_PATHS = {key: REPORTS_DIR / f"{key}.png" for key in PLOT_KEYS}
+
+# Columns read from the CSV, and dtypes that skip inference. Low-cardinality
+# strings are categories so value_counts/groupby hash int codes. release_year is
+# left to pd.to_numeric(errors="coerce") so malformed uploads don't fail the read.
+REPORT_COLUMNS = ("type", "director", "release_year", "rating", "duration", "listed_in")
+REPORT_DTYPES = {
+    "type": "category",
+    "rating": "category",
+    "director": "category",
+    "duration": "string",
+    "listed_in": "string",
+}
+
+# Screen resolution is plenty for report charts and keeps the PNGs small
+PLOT_DPI = 96
+
+# Counts per aggregate included in the AI prompt
+PROMPT_TOP_N = 10
+AI_SUMMARY_CACHE_SIZE = 8
+
+_process_pool: ProcessPoolExecutor | None = None
+# Rendered PNG bytes for the latest dataset version, see _render_plots()
+_plot_cache: dict[tuple, dict[str, bytes]] = {}
+# Last PPTX built by this process, keyed by the on-disk file's (inode, mtime, size)
+_pptx_cache: dict[tuple[int, int, int], bytes] = {}
+# Shared AsyncOpenAI client and the event loop it belongs to, see _get_ai_client()
+_ai_client = None
+_ai_client_loop = None
+# AI summaries keyed by the exact prompt (insertion-ordered, oldest evicted first)
+_ai_summary_cache: dict[str, str] = {}
+
+
+# Per-worker Figure reused for every plot (see _reset_axes)
+_fig = None
+_ax = None
+
+
+def _init_plot_worker():
+    """Process pool initializer: headless backend and plot style, once per worker."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.style.use("seaborn-v0_8-whitegrid")  # bundled with matplotlib
+    matplotlib.rcParams["path.simplify"] = True
+    matplotlib.rcParams["agg.path.chunksize"] = 10000
+
+
+def _plot_pool_size() -> int:
+    # Every uvicorn worker owns a pool, so split the cores between them
+    # (WEB_CONCURRENCY is set by the api_server launcher and honoured by uvicorn's CLI)
+    web_workers = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+    return max(1, min(len(PLOT_KEYS), (os.cpu_count() or 1) // web_workers))
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the pool is created lazily inside a running server whose
+        # threads may hold import locks (fpdf/pptx/PIL) that a forked child would inherit
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_plot_pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_plot_worker,
+        )
+    return _process_pool
 
-os.makedirs(REPORTS_DIR, exist_ok=True)
 
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool (e.g. a worker was OOM-killed) so the next call builds a fresh one."""
+    global _process_pool
+    if _process_pool is pool:
+        _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
 
-def _save_plot(fig, filename):
-    """Helper to save matplotlib figure to reports folder."""
-    out_path = os.path.join(REPORTS_DIR, filename)
-    fig.tight_layout()
-    fig.savefig(out_path)
-    plt.close(fig)
-    return out_path
 
+def _reset_axes(figsize: tuple[float, float]):
+    """
+    Return this worker's Figure/Axes resized and cleared, creating them on first use.
+    Reusing one Figure skips backend/font setup for every plot after the first.
+    """
+    global _fig, _ax
+    if _fig is None:
+        import matplotlib.pyplot as plt
+        _fig, _ax = plt.subplots(figsize=figsize, dpi=PLOT_DPI)
+    else:
+        _fig.set_size_inches(figsize)
+        _ax.clear()
+    return _fig, _ax
 
-def run_report(csv_path: str | None = None, generate_files: bool = True) -> dict:
+
+def _fig_to_png(fig) -> bytes:
     """
-    Full pipeline:
-    - Load CSV (or use data/current_dataset.csv or data/netflix_titles.csv)
-    - Clean / engineer features
-    - Generate plots
-    - Create AI summary (if enabled)
-    - Optionally generate PDF & PPT
-    Returns dict with paths and summary.
+    Helper to encode a matplotlib figure as RGB PNG bytes.
+    No alpha channel: fpdf 1.7 splits RGBA PNGs pixel by pixel in pure Python.
     """
+    from PIL import Image
 
-    # 1. Decide which CSV to use
-    if csv_path is None:
-        current_candidate = os.path.join(DATA_DIR, "current_dataset.csv")
-        default_netflix = os.path.join(DATA_DIR, "netflix_titles.csv")
+    fig.tight_layout()
+    rgba, size = fig.canvas.print_to_buffer()
+    buf = io.BytesIO()
+    Image.frombuffer("RGBA", size, rgba).convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
 
-        if os.path.exists(current_candidate):
-            csv_path = current_candidate
-        else:
-            csv_path = default_netflix
 
-    if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+def _value_counts(series: pd.Series) -> pd.Series:
+    """value_counts() with unobserved categories dropped and a plain string index."""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str)
+    return counts
 
-    # 2. Load dataset
-    df = pd.read_csv(csv_path)
 
-    # 3. Cleaning / feature engineering
+# ---------------------------
+# Plot renderers (run in worker processes; take an aggregate, return PNG bytes)
+# ---------------------------
+def _plot_top_genres(top_genres: pd.Series) -> bytes:
+    fig, ax = _reset_axes((8, 6))
+    ax.barh(top_genres.index[::-1], top_genres.values[::-1])
+    ax.set_title("Top 10 Genres")
+    ax.set_xlabel("Count")
+    ax.set_ylabel("Genre")
+    return _fig_to_png(fig)
+
+
+def _plot_top_directors(top_directors: pd.Series) -> bytes:
+    fig, ax = _reset_axes((8, 6))
+    ax.barh(top_directors.index[::-1], top_directors.values[::-1])
+    ax.set_title("Top 10 Directors")
+    ax.set_xlabel("Count")
+    ax.set_ylabel("Director")
+    return _fig_to_png(fig)
+
+
+def _plot_rating_distribution(rating_counts: pd.Series) -> bytes:
+    fig, ax = _reset_axes((6, 5))
+    ax.barh(rating_counts.index[::-1], rating_counts.values[::-1])
+    ax.set_title("Rating Distribution")
+    ax.set_xlabel("Count")
+    ax.set_ylabel("Rating")
+    return _fig_to_png(fig)
+
+
+def _plot_titles_per_year(per_year: pd.Series) -> bytes:
+    fig, ax = _reset_axes((8, 5))
+    per_year.plot(kind="line", marker="o", ax=ax)
+    ax.set_title("Titles Released per Year")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Number of Titles")
+    return _fig_to_png(fig)
+
+
+def _plot_type_count(type_counts: pd.Series) -> bytes:
+    fig, ax = _reset_axes((6, 5))
+    ax.bar(type_counts.index, type_counts.values)
+    ax.set_title("Title Type Distribution")
+    ax.set_xlabel("Type")
+    ax.set_ylabel("Count")
+    return _fig_to_png(fig)
+
+
+def _plot_avg_movie_duration(avg_duration: pd.Series) -> bytes:
+    fig, ax = _reset_axes((6, 5))
+    ax.bar(avg_duration.index, avg_duration.values)
+    ax.set_title("Average Duration by Type")
+    ax.set_xlabel("Type")
+    ax.set_ylabel("Average Duration")
+    return _fig_to_png(fig)
+
+
+# plot key → (renderer, aggregate it draws)
+PLOT_RENDERERS = {
+    "top_genres": (_plot_top_genres, "top_genres"),
+    "top_directors": (_plot_top_directors, "top_directors"),
+    "rating_distribution": (_plot_rating_distribution, "rating_counts"),
+    "titles_per_year": (_plot_titles_per_year, "per_year"),
+    "type_count": (_plot_type_count, "type_counts"),
+    "avg_movie_duration": (_plot_avg_movie_duration, "avg_duration"),
+}
+
+
+def _parse_duration(duration: pd.Series) -> pd.Series:
+    """Numeric part of the duration column as float32 (NaN where there is none)."""
+    import pandas as pd
+
+    if PYARROW_AVAILABLE:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        # One C pass inside Arrow instead of a Python-level regex call per cell
+        matches = pc.extract_regex(pa.array(duration, type=pa.string(), from_pandas=True), pattern=r"(?P<n>\d+)")
+        numbers = pc.cast(pc.struct_field(matches, "n"), pa.float32())
+        return pd.Series(numbers.to_numpy(zero_copy_only=False), index=duration.index)
+
+    return pd.to_numeric(duration.str.extract(_DURATION_RE, expand=False), errors="coerce", downcast="float")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_and_aggregate(csv_path: str, mtime_ns: int, size: int) -> dict[str, pd.Series]:
+    """
+    Load and clean the CSV and compute the aggregates used by plots and the AI summary.
+    mtime_ns/size are part of the cache key so an edited file is re-analysed.
+    """
+    import pandas as pd
+
+    # Load dataset: only the columns the report uses, with dtypes fixed up front
+    # (uploaded CSVs may lack some columns, so match against the actual header)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [c for c in header if c.strip() in REPORT_COLUMNS]
+    read_kwargs = {"memory_map": True} if CSV_ENGINE == "c" else {}
+    df = pd.read_csv(
+        csv_path,
+        engine=CSV_ENGINE,
+        usecols=usecols,
+        dtype={c: REPORT_DTYPES[c.strip()] for c in usecols if c.strip() in REPORT_DTYPES},
+        **read_kwargs,
+    )
+
+    # Cleaning / feature engineering
     df.columns = [c.strip() for c in df.columns]
 
     if "duration" in df.columns:
-        df["duration_num"] = (
-            df["duration"]
-            .astype(str)
-            .str.extract(r"(\d+)")
-            .astype(float)
-        )
+        df["duration_num"] = _parse_duration(df["duration"])
     else:
         df["duration_num"] = None
 
     if "release_year" in df.columns:
-        df["release_year"] = pd.to_numeric(df["release_year"], errors="coerce")
-
-    sns.set(style="whitegrid")
-
-    plot_files: dict[str, str] = {}
+        df["release_year"] = pd.to_numeric(df["release_year"], errors="coerce", downcast="integer")
+
+    empty = pd.Series(dtype=int)
+    aggregates = {
+        "top_genres": empty,
+        "top_directors": empty,
+        "rating_counts": empty,
+        "per_year": empty,
+        "type_counts": empty,
+        "avg_duration": empty,
+    }
 
-    # ---------------------------
-    # Top genres
-    # ---------------------------
     if "listed_in" in df.columns:
-        top_genres = (
+        aggregates["top_genres"] = (
             df["listed_in"]
             .dropna()
-            .astype(str)
-            .str.split(", ", expand=True)
-            .stack()
+            .str.split(", ")
+            .explode()
             .value_counts()
             .head(10)
         )
 
-        if not top_genres.empty:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            sns.barplot(x=top_genres.values, y=top_genres.index, dodge=False, ax=ax)
-            ax.set_title("Top 10 Genres")
-            ax.set_xlabel("Count")
-            ax.set_ylabel("Genre")
-            plot_files["top_genres"] = _save_plot(fig, "top_genres.png")
-    else:
-        top_genres = pd.Series(dtype=int)
-
-    # ---------------------------
-    # Top directors
-    # ---------------------------
     if "director" in df.columns:
-        top_directors = df["director"].dropna().value_counts().head(10)
-        if not top_directors.empty:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            sns.barplot(x=top_directors.values, y=top_directors.index, dodge=False, ax=ax)
-            ax.set_title("Top 10 Directors")
-            ax.set_xlabel("Count")
-            ax.set_ylabel("Director")
-            plot_files["top_directors"] = _save_plot(fig, "top_directors.png")
-    else:
-        top_directors = pd.Series(dtype=int)
+        aggregates["top_directors"] = _value_counts(df["director"]).head(10)
 
-    # ---------------------------
-    # Ratings distribution
-    # ---------------------------
     if "rating" in df.columns:
-        rating_counts = df["rating"].value_counts()
-        if not rating_counts.empty:
-            fig, ax = plt.subplots(figsize=(6, 5))
-            sns.countplot(
-                y="rating",
-                data=df,
-                order=rating_counts.index,
-                dodge=False,
-                ax=ax,
-            )
-            ax.set_title("Rating Distribution")
-            ax.set_xlabel("Count")
-            ax.set_ylabel("Rating")
-            plot_files["rating_distribution"] = _save_plot(fig, "rating_distribution.png")
-    else:
-        rating_counts = pd.Series(dtype=int)
+        aggregates["rating_counts"] = _value_counts(df["rating"])
 
-    # ---------------------------
-    # Titles per year (trend)
-    # ---------------------------
     if "release_year" in df.columns:
-        per_year = df["release_year"].value_counts().sort_index()
-        if not per_year.empty:
-            fig, ax = plt.subplots(figsize=(8, 5))
-            per_year.plot(kind="line", marker="o", ax=ax)
-            ax.set_title("Titles Released per Year")
-            ax.set_xlabel("Year")
-            ax.set_ylabel("Number of Titles")
-            plot_files["titles_per_year"] = _save_plot(fig, "titles_per_year.png")
-
-    # ---------------------------
-    # Type distribution (Movie vs TV Show)
-    # ---------------------------
+        aggregates["per_year"] = df["release_year"].value_counts().sort_index()
+
     if "type" in df.columns:
-        type_counts = df["type"].value_counts()
-        if not type_counts.empty:
-            fig, ax = plt.subplots(figsize=(6, 5))
-            sns.barplot(x=type_counts.index, y=type_counts.values, dodge=False, ax=ax)
-            ax.set_title("Title Type Distribution")
-            ax.set_xlabel("Type")
-            ax.set_ylabel("Count")
-            plot_files["type_count"] = _save_plot(fig, "type_count.png")
-
-    # ---------------------------
-    # Average duration by type (if available)
-    # ---------------------------
+        aggregates["type_counts"] = _value_counts(df["type"])
+
     if "duration_num" in df.columns and "type" in df.columns:
-        avg_duration = df.dropna(subset=["duration_num"]).groupby("type")["duration_num"].mean()
-        if not avg_duration.empty:
-            fig, ax = plt.subplots(figsize=(6, 5))
-            sns.barplot(x=avg_duration.index, y=avg_duration.values, dodge=False, ax=ax)
-            ax.set_title("Average Duration by Type")
-            ax.set_xlabel("Type")
-            ax.set_ylabel("Average Duration")
-            plot_files["avg_movie_duration"] = _save_plot(fig, "avg_movie_duration.png")
-
-    # ---------------------------
-    # AI Executive Summary
-    # ---------------------------
-    ai_summary = ""
-
-    if AI_ENABLED:
-        try:
-            summary_prompt = f"""
-            You are a data analyst. Summarize this Netflix dataset analysis.
-
-            - Top genres (with counts): {top_genres.to_dict()}
-            - Top directors (with counts): {top_directors.to_dict()}
-            - Ratings distribution: {rating_counts.to_dict()}
-
-            Write a short executive summary in 4–5 sentences.
-            Focus on:
-            - Which genres dominate
-            - What the rating distribution suggests about target audience
-            - Any diversity in directors or content
-            Avoid technical jargon. Write clearly for business stakeholders.
-            """
-
-            response = openai.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": summary_prompt}],
-                max_tokens=250,
-            )
-            ai_summary = response.choices[0].message.content.strip()
-            print("✅ AI Summary generated.")
-        except Exception as e:
-            print("⚠️ AI summary not generated:", e)
-    else:
+        avg_duration = df.dropna(subset=["duration_num"]).groupby("type", observed=True)["duration_num"].mean()
+        avg_duration.index = avg_duration.index.astype(str)
+        aggregates["avg_duration"] = avg_duration
+
+    return aggregates
+
+
+def _write_plot_files(plot_images: dict[str, bytes]) -> dict[str, str]:
+    """Write the PNGs to reports/<key>.png; returns key → path."""
+    plot_files: dict[str, str] = {}
+    for key, png in plot_images.items():
+        PLOT_PATHS[key].write_bytes(png)
+        plot_files[key] = str(PLOT_PATHS[key])
+    return plot_files
+
+
+async def _render_plots(
+    dataset_key: tuple, aggregates: dict[str, pd.Series]
+) -> tuple[dict[str, str], dict[str, bytes]]:
+    """
+    Render every non-empty aggregate in the process pool and write the PNGs to reports/.
+    Returns (plot_files, plot_images): paths on disk and the same PNGs in memory.
+    Only the latest dataset's images are cached.
+    """
+    plot_images = _plot_cache.get(dataset_key)
+    if plot_images is not None:
+        # Written even on a cache hit: with several server workers, another process
+        # may have replaced reports/*.png since this one cached its images.
+        plot_files = await asyncio.to_thread(_write_plot_files, plot_images)
+        return plot_files, plot_images
+
+    loop = asyncio.get_running_loop()
+
+    async def render_one(pool: ProcessPoolExecutor, key: str, data: pd.Series) -> tuple[str, bytes]:
+        # Each PNG hits disk as soon as its worker finishes, while others still render
+        png = await loop.run_in_executor(pool, PLOT_RENDERERS[key][0], data)
+        await asyncio.to_thread(_write_plot_files, {key: png})
+        return key, png
+
+    # A dead worker breaks the whole pool; replace it and retry once
+    for attempt in range(2):
+        pool = _get_process_pool()
+        jobs = []
+        for key in PLOT_KEYS:
+            data = aggregates[PLOT_RENDERERS[key][1]]
+            if not data.empty:
+                jobs.append(render_one(pool, key, data))
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if not errors:
+            break
+        if any(isinstance(e, BrokenProcessPool) for e in errors):
+            _discard_process_pool(pool)
+            if attempt == 0:
+                continue
+        raise errors[0]
+    plot_images = dict(results)
+
+    _plot_cache.clear()
+    _plot_cache[dataset_key] = plot_images
+    return {key: str(PLOT_PATHS[key]) for key in plot_images}, plot_images
+
+
+def clear_analysis_cache() -> None:
+    """Drop memoised analyses, e.g. after a new dataset has been uploaded."""
+    _load_and_aggregate.cache_clear()
+    _plot_cache.clear()
+
+
+def _counts_to_dict(counts: pd.Series) -> dict[str, int]:
+    """JSON-serialisable {label: count} (plain str keys and int values)."""
+    return {str(k): int(v) for k, v in counts.items()}
+
+
+def _top_counts_json(counts: pd.Series, n: int = PROMPT_TOP_N) -> str:
+    """JSON object of the n largest counts, for embedding in the AI prompt."""
+    return json.dumps(_counts_to_dict(counts.head(n)), ensure_ascii=False)
+
+
+def _build_summary_prompt(top_genres: pd.Series, top_directors: pd.Series, rating_counts: pd.Series) -> str:
+    return f"""
+        You are a data analyst. Summarize this Netflix dataset analysis.
+
+        - Top genres (with counts): {_top_counts_json(top_genres)}
+        - Top directors (with counts): {_top_counts_json(top_directors)}
+        - Ratings distribution (top {PROMPT_TOP_N}): {_top_counts_json(rating_counts)}
+
+        Write a short executive summary in 4–5 sentences.
+        Focus on:
+        - Which genres dominate
+        - What the rating distribution suggests about target audience
+        - Any diversity in directors or content
+        Avoid technical jargon. Write clearly for business stakeholders.
+        """
+
+
+def _get_ai_client():
+    """
+    One AsyncOpenAI client per event loop, so its connection pool (and TLS session)
+    is reused across reports instead of reconnecting for every summary.
+    """
+    global _ai_client, _ai_client_loop
+    loop = asyncio.get_running_loop()
+    if _ai_client is None or _ai_client_loop is not loop:
+        import openai
+
+        _ai_client = openai.AsyncOpenAI()
+        _ai_client_loop = loop
+    return _ai_client
+
+
+async def _close_ai_client() -> None:
+    """Close the cached client before its event loop goes away (see run_report())."""
+    global _ai_client, _ai_client_loop
+    if _ai_client is not None and _ai_client_loop is asyncio.get_running_loop():
+        client, _ai_client, _ai_client_loop = _ai_client, None, None
+        await client.close()
+
+
+async def _generate_ai_summary(top_genres: pd.Series, top_directors: pd.Series, rating_counts: pd.Series) -> str:
+    """
+    Ask the LLM for a short executive summary of the aggregates.
+    Uses the async client so the request overlaps with plot rendering.
+    Summaries are cached by prompt, so re-running on the same data skips the call.
+    Returns "" if AI is disabled or the call fails.
+    """
+    if not AI_ENABLED:
         print("AI integration not enabled. Install 'openai' and set OPENAI_API_KEY to use this feature.")
+        return ""
+
+    summary_prompt = _build_summary_prompt(top_genres, top_directors, rating_counts)
+    if summary_prompt in _ai_summary_cache:
+        print("✅ AI Summary reused from cache.")
+        return _ai_summary_cache[summary_prompt]
+
+    try:
+        response = await _get_ai_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": summary_prompt}],
+            max_tokens=250,
+        )
+        ai_summary = response.choices[0].message.content.strip()
+        print("✅ AI Summary generated.")
+    except Exception as e:
+        print("⚠️ AI summary not generated:", e)
+        return ""
 
-    pdf_file = None
-    ppt_file = None
+    if ai_summary:
+        if len(_ai_summary_cache) >= AI_SUMMARY_CACHE_SIZE:
+            _ai_summary_cache.pop(next(iter(_ai_summary_cache)))  # evict oldest
+        _ai_summary_cache[summary_prompt] = ai_summary
+    return ai_summary
 
-    if generate_files:
-        # ---------------------------
-        # Generate PDF report
-        # ---------------------------
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        pdf.cell(0, 10, "Netflix Analysis Report", ln=True, align="C")
+
+def _tmp_sibling(path: Path, suffix: str = ".tmp") -> Path:
+    """Unique scratch file next to `path` (same filesystem, so os.replace is atomic)."""
+    return path.with_name(f"{path.stem}.{uuid.uuid4().hex}{suffix}")
+
+
+def _build_pdf(plot_images: dict[str, bytes], ai_summary: str) -> str:
+    """Build the PDF report (blocking; run off the event loop)."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, "Netflix Analysis Report", ln=True, align="C")
+    pdf.ln(10)
+
+    if ai_summary:
+        pdf.set_font("Arial", "", 12)
+        pdf.multi_cell(0, 8, ai_summary)
         pdf.ln(10)
 
-        if ai_summary:
-            pdf.set_font("Arial", "", 12)
-            pdf.multi_cell(0, 8, ai_summary)
-            pdf.ln(10)
-
-        for key in [
-            "top_genres",
-            "top_directors",
-            "rating_distribution",
-            "titles_per_year",
-            "type_count",
-            "avg_movie_duration",
-        ]:
-            if key in plot_files:
-                pdf.image(plot_files[key], w=180)
+    # fpdf 1.7.2 only embeds images by file name: give it this run's own PNGs rather
+    # than reports/*.png, which an overlapping run for another dataset may overwrite.
+    # Output goes to a temp file swapped in, so a download in flight never sees a partial PDF.
+    tmp_files = []
+    try:
+        for key in PLOT_KEYS:
+            if key in plot_images:
+                png_path = _tmp_sibling(PLOT_PATHS[key], ".png")
+                tmp_files.append(png_path)
+                png_path.write_bytes(plot_images[key])
+                pdf.image(str(png_path), w=180)
                 pdf.ln(8)
 
-        pdf_file = os.path.join(REPORTS_DIR, "netflix_report.pdf")
-        pdf.output(pdf_file)
-        print(f"✅ PDF report generated: {pdf_file}")
-
-        # ---------------------------
-        # Generate PowerPoint report
-        # ---------------------------
-        ppt = Presentation()
-        blank_layout = ppt.slide_layouts[5]  # blank
-
-        slide = ppt.slides.add_slide(blank_layout)
-        title_box = slide.shapes.add_textbox(Inches(0.7), Inches(0.3), Inches(8.0), Inches(1.0))
-        title_frame = title_box.text_frame
-        title_frame.text = "Executive Summary"
-        title_frame.paragraphs[0].font.size = Pt(28)
-
-        if ai_summary:
-            body_box = slide.shapes.add_textbox(Inches(0.7), Inches(1.2), Inches(8.0), Inches(4.5))
-            body_frame = body_box.text_frame
-            body_frame.text = ai_summary
-            body_frame.paragraphs[0].font.size = Pt(16)
-
-        for key in [
-            "top_genres",
-            "top_directors",
-            "rating_distribution",
-            "titles_per_year",
-            "type_count",
-            "avg_movie_duration",
-        ]:
-            if key in plot_files:
-                slide = ppt.slides.add_slide(blank_layout)
-                slide.shapes.add_picture(plot_files[key], Inches(0.7), Inches(0.7), width=Inches(8.5))
-
-        ppt_file = os.path.join(REPORTS_DIR, "netflix_report.pptx")
-        ppt.save(ppt_file)
-        print(f"✅ PowerPoint report generated: {ppt_file}")
+        tmp_pdf = _tmp_sibling(PDF_PATH)
+        tmp_files.append(tmp_pdf)
+        pdf.output(str(tmp_pdf), "F")
+        os.replace(tmp_pdf, PDF_PATH)
+    finally:
+        for tmp_path in tmp_files:
+            tmp_path.unlink(missing_ok=True)
+
+    pdf_file = str(PDF_PATH)
+    print(f"✅ PDF report generated: {pdf_file}")
+    return pdf_file
+
+
+def _build_ppt(plot_images: dict[str, bytes], ai_summary: str) -> str:
+    """Build the PowerPoint report (blocking; run off the event loop)."""
+    global _pptx_cache
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+
+    ppt = Presentation()
+    blank_layout = ppt.slide_layouts[5]  # blank
+
+    slide = ppt.slides.add_slide(blank_layout)
+    title_box = slide.shapes.add_textbox(Inches(0.7), Inches(0.3), Inches(8.0), Inches(1.0))
+    title_frame = title_box.text_frame
+    title_frame.text = "Executive Summary"
+    title_frame.paragraphs[0].font.size = Pt(28)
+
+    if ai_summary:
+        body_box = slide.shapes.add_textbox(Inches(0.7), Inches(1.2), Inches(8.0), Inches(4.5))
+        body_frame = body_box.text_frame
+        body_frame.text = ai_summary
+        body_frame.paragraphs[0].font.size = Pt(16)
+
+    for key in PLOT_KEYS:
+        if key in plot_images:
+            slide = ppt.slides.add_slide(blank_layout)
+            slide.shapes.add_picture(io.BytesIO(plot_images[key]), Inches(0.7), Inches(0.7), width=Inches(8.5))
+
+    # Serialise once in memory: the same bytes go to disk and to /get-report/pptx
+    buf = io.BytesIO()
+    ppt.save(buf)
+    pptx_bytes = buf.getvalue()
+
+    # Write aside and swap in, so a download in flight never sees a half-written file;
+    # the cache key comes from the file we wrote, not a later stat another worker may race
+    tmp_path = _tmp_sibling(PPTX_PATH)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(pptx_bytes)
+            f.flush()
+            version = _file_version(os.fstat(f.fileno()))
+        os.replace(tmp_path, PPTX_PATH)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    _pptx_cache = {version: pptx_bytes}
+
+    ppt_file = str(PPTX_PATH)
+    print(f"✅ PowerPoint report generated: {ppt_file}")
+    return ppt_file
+
+
+def _file_version(stat_result: os.stat_result) -> tuple[int, int, int]:
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def get_cached_pptx(stat_result: os.stat_result) -> bytes | None:
+    """
+    Bytes of the last PPTX this process built, if PPTX_PATH (as described by
+    stat_result) is still that file; None if it was rewritten, e.g. by another worker.
+    """
+    return _pptx_cache.get(_file_version(stat_result))
+
+
+async def _build_reports(plot_images: dict[str, bytes], ai_summary: str) -> tuple[str, str]:
+    """Build the PDF and PPT concurrently in threads from this run's in-memory PNGs."""
+    pdf_file, ppt_file = await asyncio.gather(
+        asyncio.to_thread(_build_pdf, plot_images, ai_summary),
+        asyncio.to_thread(_build_ppt, plot_images, ai_summary),
+    )
+    return pdf_file, ppt_file
+
+
+async def run_report_async(
+    csv_path: str | None = None,
+    generate_files: bool = True,
+    render_plots: bool | None = None,
+) -> dict:
+    """
+    Full pipeline:
+    - Load CSV (or use data/current_dataset.csv or data/netflix_titles.csv)
+    - Clean / engineer features
+    - Generate plots (in parallel worker processes; skipped if render_plots is False,
+      which defaults to generate_files)
+    - Create AI summary (if enabled)
+    - Optionally generate PDF & PPT
+    Returns dict with paths, summary and the numeric summaries.
+    """
+    if render_plots is None:
+        render_plots = generate_files
+
+    # 1. Decide which CSV to use
+    if csv_path is None:
+        if CURRENT_DATASET_PATH.exists():
+            csv_path = str(CURRENT_DATASET_PATH)
+        else:
+            csv_path = str(DEFAULT_DATASET_PATH)
+
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    # 2. Load, clean and aggregate (memoised per dataset version)
+    stat = os.stat(csv_path)
+    dataset_key = (csv_path, stat.st_mtime_ns, stat.st_size)
+    aggregates = await asyncio.to_thread(_load_and_aggregate, *dataset_key)
+
+    top_genres = aggregates["top_genres"]
+    top_directors = aggregates["top_directors"]
+    rating_counts = aggregates["rating_counts"]
+
+    # 3. AI summary starts as soon as its aggregates exist and runs in the
+    #    background while the plots render; awaited just before the reports
+    ai_task = asyncio.create_task(_generate_ai_summary(top_genres, top_directors, rating_counts))
+
+    # 4. Plots
+    plot_files: dict[str, str] = {}
+    plot_images: dict[str, bytes] = {}
+    try:
+        if render_plots:
+            plot_files, plot_images = await _render_plots(dataset_key, aggregates)
+    except BaseException:
+        ai_task.cancel()
+        raise
 
+    ai_summary = await ai_task
+
+    # 5. Reports
+    pdf_file = None
+    ppt_file = None
+
+    if generate_files:
+        pdf_file, ppt_file = await _build_reports(plot_images, ai_summary)
         print("🎉 All tasks completed! Check 'reports/' for plots, PDF, PPT, and AI summary.")
 
     return {
@@ -291,9 +659,38 @@ def run_report(csv_path: str | None = None, generate_files: bool = True) -> dict
         "ppt_file": ppt_file,
         "ai_summary": ai_summary,
         "plots": plot_files,
+        "summaries": {
+            "top_genres": _counts_to_dict(top_genres),
+            "top_directors": _counts_to_dict(top_directors),
+            "rating_counts": _counts_to_dict(rating_counts),
+        },
     }
 
 
+def run_report(csv_path: str | None = None, generate_files: bool = True) -> dict:
+    """
+    Synchronous entry point for scripts / CLI / notebooks; see run_report_async().
+    Inside a running event loop (e.g. Jupyter) the report runs on a helper thread with
+    its own loop and this call blocks until it finishes; prefer `await run_report_async()` there.
+    """
+
+    async def _run() -> dict:
+        # asyncio.run() closes its loop on return, so the client's connections go with it
+        try:
+            return await run_report_async(csv_path=csv_path, generate_files=generate_files)
+        finally:
+            await _close_ai_client()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_run())
+
+    # asyncio.run() refuses to nest inside a running loop
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _run()).result()
+
+
 if __name__ == "__main__":
     # Run locally from terminal:
     # (venv) python scripts/generate_report.py